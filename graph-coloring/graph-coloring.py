@@ -1,6 +1,14 @@
 import sys
 import os
 
+import numpy as np
+
+# Output buffer size for CNF files (bytes)
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Number of clauses formatted per write call
+CLAUSE_CHUNK_SIZE = 4096
+
 def read_graph(filename):
     """
     Read a graph in DIMACS format from a file.
@@ -15,29 +23,78 @@ def read_graph(filename):
         
     Returns:
         tuple: (n, edges) where n is the number of vertices and 
-               edges is a list of tuples (u, v) representing edges
+               edges is an (m, 2) int32 array with one row (u, v) per edge
     """
+    with open(filename, 'rb') as file:
+        data = file.read()
+    
+    # The file is tokenized as one byte array; all bytes up to ' ' count as whitespace
+    buf = np.frombuffer(bytearray(data), dtype=np.uint8)
+    is_space = buf <= ord(' ')
+    token_start = ~is_space
+    token_start[1:] &= is_space[:-1]
+    token_offsets = np.flatnonzero(token_start)
+    
+    # Line i spans buf[line_starts[i]:line_ends[i]] and holds the tokens
+    # token_offsets[first_tokens[i]:first_tokens[i] + tokens_per_line[i]]
+    newlines = np.flatnonzero(buf == ord('\n'))
+    line_starts = np.concatenate(([0], newlines + 1))
+    line_ends = np.append(newlines, len(buf))
+    first_tokens = np.searchsorted(token_offsets, line_starts)
+    tokens_per_line = np.searchsorted(token_offsets, line_ends) - first_tokens
+    
+    # The line type is its first token if that is a single character ('e', 'p', 'c')
+    line_ids = np.flatnonzero(tokens_per_line)
+    first_token = token_offsets[first_tokens[line_ids]]
+    after = first_token + 1
+    single = after == len(buf)
+    single[~single] = is_space[after[~single]]
+    line_type = np.where(single, buf[first_token], 0)
+    is_edge = line_type == ord('e')
+    edge_lines = line_ids[is_edge]
+    
     n = 0
-    edges = []
-    
-    with open(filename, 'r') as file:
-        for line in file:
-            line = line.strip()
-            # Skip empty lines and comments
-            if not line or line.startswith('c'):
-                continue
-            
-            parts = line.split()
-            if parts[0] == 'p':
-                # Parse the problem line: p edge n m
-                n = int(parts[2])
-            elif parts[0] == 'e':
-                # Parse an edge line: e u v
-                u, v = int(parts[1]), int(parts[2])
-                edges.append((u, v))
+    for line in line_ids[line_type == ord('p')]:
+        # Parse the problem line: p edge n m
+        n = int(data[line_starts[line]:line_ends[line]].split()[2])
+    
+    short = edge_lines[tokens_per_line[edge_lines] < 3]
+    if len(short):
+        line = data[line_starts[short[0]]:line_ends[short[0]]]
+        raise ValueError(f"Edge line without two endpoints: {line.strip().decode(errors='replace')}")
+    
+    # Blank out everything except the endpoints u, v of the edge lines "e u v":
+    # the 'e' itself, all other lines, and fields after the two endpoints
+    buf[first_token[is_edge]] = ord(' ')
+    other_lines = line_ids[~is_edge]
+    _blank_ranges(buf, line_starts[other_lines], line_ends[other_lines])
+    extra_fields = edge_lines[tokens_per_line[edge_lines] > 3]
+    _blank_ranges(buf, token_offsets[first_tokens[extra_fields] + 3], line_ends[extra_fields])
+    
+    # Parse all edge endpoints with a single NumPy call
+    edges = np.fromstring(buf.tobytes(), dtype=np.int32, sep=' ')
+    if len(edges) != 2 * len(edge_lines):
+        raise ValueError("Edge endpoints must be integers")
+    edges = edges.reshape(-1, 2)
     
     return n, edges
 
+def _blank_ranges(buf, starts, ends):
+    """
+    Overwrite buf[starts[i]:ends[i]] with spaces for every i.
+    
+    Args:
+        buf (np.ndarray): Writable uint8 array
+        starts (np.ndarray): Start offsets of the ranges
+        ends (np.ndarray): End offsets (exclusive) of the ranges
+    """
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total:
+        # Offset of every byte in the ranges, without a Python loop over ranges
+        range_bases = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        buf[range_bases + np.arange(total)] = ord(' ')
+
 def encode_graph_coloring(n, edges, k):
     """
     Encode the k-colorability problem as a SAT instance using the traditional encoding.
@@ -49,52 +106,81 @@ def encode_graph_coloring(n, edges, k):
     
     Args:
         n (int): Number of vertices in the graph
-        edges (list): List of edges as tuples (u, v)
+        edges (list or np.ndarray): Edges as tuples (u, v) or an (m, 2) array
         k (int): Number of colors
         
     Returns:
-        list: List of clauses, where each clause is a list of integers representing literals
+        np.ndarray: Flat int32 array of literals in which every clause is terminated by 0,
+                    as in the DIMACS format (see iter_clauses)
     """
-    clauses = []
-    
-    # Variable indexing function: maps vertex v and color c to a unique variable index
-    # Variables are numbered from 1 to n*k
-    def var_index(v, c):
-        """
-        Convert vertex and color to variable index.
-        For vertex v and color c, the variable index is (v-1)*k + c
-        
-        Args:
-            v (int): Vertex number (1-indexed)
-            c (int): Color number (1-indexed)
-            
-        Returns:
-            int: Variable index for SAT formula
-        """
-        return (v - 1) * k + c
+    # Variable index grid: V[v-1, c-1] is the variable for vertex v and color c.
+    # Variables are numbered from 1 to n*k, i.e. x_{v,c} = (v-1)*k + c
+    V = (np.arange(1, n + 1, dtype=np.int32)[:, None] - 1) * k + np.arange(1, k + 1, dtype=np.int32)[None, :]
     
     # 1. Every vertex must have at least one color
-    for v in range(1, n + 1):
-        # Create a clause (x_{v,1} ∨ x_{v,2} ∨ ... ∨ x_{v,k})
-        clause = [var_index(v, c) for c in range(1, k + 1)]
-        clauses.append(clause)
+    # Each row of V is the clause (x_{v,1} ∨ x_{v,2} ∨ ... ∨ x_{v,k})
+    at_least_one = V
     
     # 2. Every vertex must have at most one color
-    for v in range(1, n + 1):
-        for c1 in range(1, k + 1):
-            for c2 in range(c1 + 1, k + 1):
-                # Create a clause (¬x_{v,c1} ∨ ¬x_{v,c2})
-                # This ensures vertex v cannot have both colors c1 and c2
-                clauses.append([-var_index(v, c1), -var_index(v, c2)])
+    # For every color pair c1 < c2 create the clause (¬x_{v,c1} ∨ ¬x_{v,c2}).
+    # The pair table is the same for every vertex, so it is built once with
+    # shape (k(k-1)/2, 2) and shifted by the vertex offset (v-1)*k
+    color_pairs = np.stack(np.triu_indices(k, 1), axis=-1).astype(np.int32) + 1
+    vertex_offsets = np.arange(n, dtype=np.int32)[:, None, None] * k
+    at_most_one = -(vertex_offsets + color_pairs[None, :, :]).reshape(-1, 2)
     
     # 3. Adjacent vertices must have different colors
-    for u, v in edges:
-        for c in range(1, k + 1):
-            # Create a clause (¬x_{u,c} ∨ ¬x_{v,c})
-            # This ensures vertices u and v cannot both have color c
-            clauses.append([-var_index(u, c), -var_index(v, c)])
+    # For every edge (u, v) and color c create the clause (¬x_{u,c} ∨ ¬x_{v,c}),
+    # for all m*k (edge, color) pairs at once from the endpoint offsets (u-1)*k
+    edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+    colors = np.arange(1, k + 1, dtype=np.int32)
+    edge_offsets = (edges - 1) * k
+    different_colors = -(edge_offsets[:, None, :] + colors[None, :, None]).reshape(-1, 2)
+    
+    return np.concatenate([
+        _zero_terminated(at_least_one),
+        _zero_terminated(at_most_one),
+        _zero_terminated(different_colors),
+    ])
+
+def _zero_terminated(block):
+    """
+    Flatten a block of equally long clauses, terminating each clause with 0.
+    
+    Args:
+        block (np.ndarray): (num_clauses, clause_length) array of literals
+        
+    Returns:
+        np.ndarray: Flat int32 array of num_clauses * (clause_length + 1) literals
+    """
+    terminators = np.zeros((block.shape[0], 1), dtype=np.int32)
+    return np.hstack([block.astype(np.int32), terminators]).ravel()
+
+def iter_clauses(clauses):
+    """
+    Iterate over the clauses of a flat, zero-terminated literal array.
+    
+    Args:
+        clauses (np.ndarray or array.array): Literals with a 0 after every clause
+        
+    Yields:
+        list: The literals of one clause, without the terminating 0
+    """
+    literals = np.asarray(clauses)
     
-    return clauses
+    # Literals are converted to Python ints one block of CLAUSE_CHUNK_SIZE
+    # clauses at a time, never for the whole array at once
+    clause_ends = np.flatnonzero(literals == 0)
+    block_ends = clause_ends[CLAUSE_CHUNK_SIZE - 1::CLAUSE_CHUNK_SIZE].tolist() + [len(literals) - 1]
+    block_start = 0
+    for block_end in block_ends:
+        block = literals[block_start:block_end + 1].tolist()
+        start = 0
+        while start < len(block):
+            end = block.index(0, start)
+            yield block[start:end]
+            start = end + 1
+        block_start = block_end + 1
 
 def write_dimacs_cnf(clauses, num_vars, output_file=None):
     """
@@ -107,26 +193,102 @@ def write_dimacs_cnf(clauses, num_vars, output_file=None):
       and each clause ends with a 0
     
     Args:
-        clauses (list): List of clauses, where each clause is a list of integers
+        clauses (np.ndarray or array.array): Flat literal array with a 0 after every clause
         num_vars (int): Number of variables in the formula
         output_file (str, optional): Path to output file. If None, print to stdout
     """
-    num_clauses = len(clauses)
-    # Create the header line
-    lines = [f"p cnf {num_vars} {num_clauses}"]
+    if output_file:
+        with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as file:
+            _write_clauses(file, clauses, num_vars)
+    else:
+        sys.stdout.flush()
+        _write_clauses(sys.stdout.buffer, clauses, num_vars)
+        sys.stdout.buffer.flush()
+
+def _write_clauses(file, clauses, num_vars):
+    """
+    Stream the header and clauses to an open binary file.
     
-    # Create a line for each clause
-    for clause in clauses:
-        # Each clause is space-separated and ends with 0
-        lines.append(" ".join(map(str, clause)) + " 0")
+    Clauses are formatted and written in blocks of CLAUSE_CHUNK_SIZE lines,
+    so the complete formula never has to be held in memory as one string.
+    The text of every literal is looked up in tables built once per call
+    instead of converting each integer with str().
     
-    output = "\n".join(lines)
+    Args:
+        file: Writable binary file object
+        clauses (np.ndarray or array.array): Flat literal array with a 0 after every clause
+        num_vars (int): Number of variables in the formula
+    """
+    # pos[v] and neg[v] are the encoded literals v and -v followed by a space.
+    # Index 0 holds the clause terminator, so each clause ends with "0" and a newline
+    pos = [b"%d " % v for v in range(num_vars + 1)]
+    neg = [b"-" + p for p in pos]
+    pos[0] = neg[0] = b"0\n"
     
-    if output_file:
-        with open(output_file, 'w') as file:
-            file.write(output)
-    else:
-        print(output)
+    literals = np.asarray(clauses)
+    clause_ends = np.flatnonzero(literals == 0)
+    
+    # Write the header line
+    file.write(b"p cnf %d %d\n" % (num_vars, len(clause_ends)))
+    
+    # Each chunk ends after every CLAUSE_CHUNK_SIZE-th clause terminator
+    chunk_ends = clause_ends[CLAUSE_CHUNK_SIZE - 1::CLAUSE_CHUNK_SIZE].tolist() + [len(literals) - 1]
+    start = 0
+    for end in chunk_ends:
+        chunk = literals[start:end + 1].tolist()
+        file.write(b"".join([pos[lit] if lit > 0 else neg[-lit] for lit in chunk]))
+        start = end + 1
+
+def minimum_coloring(n, edges, k_min, k_max):
+    """
+    Find the smallest k in [k_min, k_max] for which the graph is k-colorable.
+    
+    The graph is encoded once for k_max colors and kept in a single incremental
+    SAT solver. Every color c gets a selector variable d_c with the clauses
+    (¬d_c ∨ ¬x_{v,c}) for all vertices v, so assuming d_c disables color c.
+    The trial for k colors is solved under the assumptions d_{k+1}, ..., d_{k_max},
+    which lets clauses learned in earlier trials be reused in later ones.
+    
+    Args:
+        n (int): Number of vertices in the graph
+        edges (list or np.ndarray): Edges as tuples (u, v) or an (m, 2) array
+        k_min (int): Smallest number of colors to try
+        k_max (int): Largest number of colors to try
+        
+    Returns:
+        tuple: (k, coloring) where k is the minimum number of colors and coloring
+               maps each vertex to its color, or (None, None) if no k in the range works
+    """
+    from pysat.solvers import Glucose3
+    
+    clauses = encode_graph_coloring(n, edges, k_max)
+    
+    # Selector variable d_c is numbered n*k_max + c, after the coloring variables
+    num_color_vars = n * k_max
+    colors = np.arange(1, k_max + 1, dtype=np.int32)
+    selectors = np.repeat(num_color_vars + colors, n)
+    color_vars = (colors[:, None] + np.arange(n, dtype=np.int32)[None, :] * k_max).ravel()
+    disable_clauses = _zero_terminated(-np.stack([selectors, color_vars], axis=-1))
+    
+    solver = Glucose3(bootstrap_with=iter_clauses(np.concatenate([clauses, disable_clauses])))
+    
+    try:
+        for k in range(k_min, k_max + 1):
+            assumptions = list(range(num_color_vars + k + 1, num_color_vars + k_max + 1))
+            if solver.solve(assumptions=assumptions):
+                model = solver.get_model()
+                coloring = {}
+                for v in range(1, n + 1):
+                    for c in range(1, k + 1):
+                        if model[(v - 1) * k_max + c - 1] > 0:
+                            coloring[v] = c
+                            break
+                return k, coloring
+    finally:
+        # Clean up
+        solver.delete()
+    
+    return None, None
 
 def main():
     """
@@ -134,14 +296,21 @@ def main():
     
     Command line arguments:
     1. Path to the graph file in DIMACS format
-    2. Number of colors (k)
+    2. Number of colors (k), or "--min k_min k_max" to search for the
+       smallest number of colors with minimum_coloring
     
     Example usage:
     python graph_coloring.py myciel3.col 3
+    python graph_coloring.py myciel3.col --min 2 6
     """
     # Parse command line arguments
-    if len(sys.argv) != 3:
+    if len(sys.argv) == 5 and sys.argv[2] == "--min":
+        search_minimum = True
+    elif len(sys.argv) == 3:
+        search_minimum = False
+    else:
         print("Usage: python graph_coloring.py <graph_file> <k>")
+        print("       python graph_coloring.py <graph_file> --min <k_min> <k_max>")
         sys.exit(1)
     
     # Get the graph file path
@@ -152,6 +321,17 @@ def main():
         # Assuming the graph files are in the 'test' directory
         graph_file = os.path.join('test', graph_file)
     
+    if search_minimum:
+        k_min, k_max = int(sys.argv[3]), int(sys.argv[4])
+        n, edges = read_graph(graph_file)
+        k, coloring = minimum_coloring(n, edges, k_min, k_max)
+        if k is None:
+            print(f"Not colorable with {k_max} colors")
+        else:
+            print(f"Minimum number of colors: {k}")
+            print(" ".join(f"{v}:{coloring[v]}" for v in range(1, n + 1)))
+        return
+    
     # Get the number of colors
     k = int(sys.argv[2])
     
@@ -10,46 +10,109 @@ Course: SAT Solving SS 2025
 """
 
 import sys
+from array import array
+from types import MappingProxyType
 from pysat.solvers import Glucose3
 
+# Known solution counts (OEIS A000170) used to verify results
+KNOWN_RESULTS = MappingProxyType({
+    4: 2, 5: 10, 6: 4, 7: 40, 8: 92, 9: 352, 10: 724,
+    11: 2680, 12: 14200, 13: 73712, 14: 365596
+})
+
+def at_most_one(variables, next_var_id, clauses):
+    """
+    Encode "at most one of variables is true" with the sequential counter (Sinz) encoding.
+    
+    Auxiliary variables s_1..s_{m-1} are introduced, where s_i means "one of
+    x_1..x_i is true". This needs 3m-4 clauses instead of the m(m-1)/2 clauses
+    of the pairwise encoding. Groups of up to 5 variables are encoded pairwise,
+    which is no larger and needs no auxiliary variables.
+    
+    Args:
+        variables (list): Variable numbers of which at most one may be true
+        next_var_id (int): First unused variable number for auxiliary variables
+        clauses (array.array): Flat clause array the zero-terminated clauses are appended to
+        
+    Returns:
+        int: The first variable number still unused
+    """
+    m = len(variables)
+    
+    if m <= 5:
+        for v1_idx in range(m):
+            for v2_idx in range(v1_idx + 1, m):
+                clauses.extend((-variables[v1_idx], -variables[v2_idx], 0))
+        return next_var_id
+    
+    # s[i] is the counter variable for the prefix x_1..x_{i+1}
+    s = list(range(next_var_id, next_var_id + m - 1))
+    
+    clauses.extend((-variables[0], s[0], 0))
+    for i in range(1, m - 1):
+        clauses.extend((
+            -variables[i], s[i], 0,
+            -s[i - 1], s[i], 0,
+            -variables[i], -s[i - 1], 0,
+        ))
+    clauses.extend((-variables[m - 1], -s[m - 2], 0))
+    
+    return next_var_id + m - 1
+
+def iter_clauses(clauses):
+    """
+    Iterate over the clauses of a flat, zero-terminated clause array.
+    
+    Args:
+        clauses (array.array): Literals with a 0 after every clause
+        
+    Yields:
+        list: The literals of one clause, without the terminating 0
+    """
+    # Each clause is converted to Python ints on its own, so the whole array
+    # is never held as a list
+    start = 0
+    while start < len(clauses):
+        end = clauses.index(0, start)
+        yield clauses[start:end].tolist()
+        start = end + 1
+
 def encode_nqueens(n):
     """
     Encode the N-Queens problem as SAT clauses.
     
     Variables: x_{i,j} = True if there's a queen at position (i,j)
     Variable numbering: x_{i,j} gets variable number i*n + j + 1 (1-indexed)
+    Auxiliary variables of the at-most-one constraints are numbered from n*n + 1
+    
+    Clauses are stored as in DIMACS: one flat array('i') of literals in which
+    every clause is terminated by 0 (see iter_clauses).
     
     Args:
         n (int): Board size (n x n)
         
     Returns:
-        tuple: (clauses, num_vars) where clauses is list of clauses and num_vars is total variables
+        tuple: (clauses, num_vars) where clauses is the flat clause array and num_vars is total variables
     """
-    clauses = []
-    num_vars = n * n
+    clauses = array('i')
+    next_var_id = n * n + 1
     
-    def var(i, j):
-        """Convert (i,j) position to variable number (1-indexed for SAT solver)"""
-        return i * n + j + 1
+    # Position (i,j) is variable i*n + j + 1; the arithmetic is written out
+    # inline below to avoid a function call per literal
     
     # Constraint 1: Exactly one queen per row
     for i in range(n):
         # At least one queen per row
-        row_clause = []
-        for j in range(n):
-            row_clause.append(var(i, j))
-        clauses.append(row_clause)
+        row_clause = list(range(i * n + 1, i * n + n + 1))
+        clauses.extend(row_clause)
+        clauses.append(0)
         
         # At most one queen per row
-        for j1 in range(n):
-            for j2 in range(j1 + 1, n):
-                clauses.append([-var(i, j1), -var(i, j2)])
+        next_var_id = at_most_one(row_clause, next_var_id, clauses)
     
     # Constraint 2: At most one queen per column
     for j in range(n):
-        for i1 in range(n):
-            for i2 in range(i1 + 1, n):
-                clauses.append([-var(i1, j), -var(i2, j)])
+        next_var_id = at_most_one(list(range(j + 1, n * n + 1, n)), next_var_id, clauses)
     
     # Constraint 3: At most one queen per diagonal (top-left to bottom-right)
     for d in range(-(n-1), n):  # diagonal offset
@@ -57,12 +120,10 @@ def encode_nqueens(n):
         for i in range(n):
             j = i + d
             if 0 <= j < n:
-                diagonal_vars.append(var(i, j))
+                diagonal_vars.append(i * n + j + 1)
         
         # At most one queen per diagonal
-        for v1_idx in range(len(diagonal_vars)):
-            for v2_idx in range(v1_idx + 1, len(diagonal_vars)):
-                clauses.append([-diagonal_vars[v1_idx], -diagonal_vars[v2_idx]])
+        next_var_id = at_most_one(diagonal_vars, next_var_id, clauses)
     
     # Constraint 4: At most one queen per anti-diagonal (top-right to bottom-left)
     for d in range(2 * n - 1):  # anti-diagonal sum
@@ -70,12 +131,12 @@ def encode_nqueens(n):
         for i in range(n):
             j = d - i
             if 0 <= j < n:
-                antidiagonal_vars.append(var(i, j))
+                antidiagonal_vars.append(i * n + j + 1)
         
         # At most one queen per anti-diagonal
-        for v1_idx in range(len(antidiagonal_vars)):
-            for v2_idx in range(v1_idx + 1, len(antidiagonal_vars)):
-                clauses.append([-antidiagonal_vars[v1_idx], -antidiagonal_vars[v2_idx]])
+        next_var_id = at_most_one(antidiagonal_vars, next_var_id, clauses)
+    
+    num_vars = next_var_id - 1
     
     return clauses, num_vars
 
@@ -90,13 +151,10 @@ def decode_solution(model, n):
     Returns:
         list: List of (row, col) tuples representing queen positions
     """
-    def var(i, j):
-        return i * n + j + 1
-    
     queens = []
     for i in range(n):
         for j in range(n):
-            var_num = var(i, j)
+            var_num = i * n + j + 1
             if var_num <= len(model) and model[var_num - 1] > 0:
                 queens.append((i, j))
     
@@ -112,41 +170,70 @@ def print_board(queens, n):
         print(' '.join(row))
     print()
 
-def count_solutions(n, verbose=False):
+def count_solutions(n, verbose=False, max_solutions=None, solver=None, use_jit=False):
     """
     Count all solutions to the N-Queens problem using incremental SAT.
     
+    A Glucose3 instance can be passed in to reuse one solver across several
+    calls (e.g. a sweep over n). The instance's variables are then shifted past
+    the variables already in the solver and every clause is guarded by a fresh
+    selector literal, which is assumed while counting and disabled afterwards.
+    
     Args:
         n (int): Board size
         verbose (bool): If True, print debug information
+        max_solutions (int, optional): Stop enumerating once this many solutions are found
+        solver (Glucose3, optional): Shared solver; it is left open for further calls
+        use_jit (bool): Encode with the Numba encoder from nqueens_numba. Loading
+                        Numba takes far longer than encoding any countable n in
+                        Python, so this is off by default
         
     Returns:
-        int: Number of solutions
+        int: Number of solutions (at most max_solutions if given)
     """
     print(f"Encoding {n}-Queens problem...")
     
     # Get the SAT encoding
-    clauses, num_vars = encode_nqueens(n)
+    if use_jit:
+        from nqueens_numba import encode_nqueens as encode_nqueens_jit
+        clauses, num_vars = encode_nqueens_jit(n)
+    else:
+        clauses, num_vars = encode_nqueens(n)
     
-    print(f"Generated {len(clauses)} clauses with {num_vars} variables")
+    print(f"Generated {clauses.count(0)} clauses with {num_vars} variables")
     
-    # Initialize the SAT solver
-    solver = Glucose3()
+    if solver is None:
+        # Initialize the SAT solver
+        own_solver = True
+        solver = Glucose3()
+        var_offset = 0
+        guard = []
+        assumptions = []
+    else:
+        own_solver = False
+        # nof_vars() is -1 for a solver without any clauses
+        var_offset = max(solver.nof_vars(), 0)
+        selector = var_offset + num_vars + 1
+        guard = [-selector]
+        assumptions = [selector]
     
     # Add all N-Queens constraints
-    for clause in clauses:
-        solver.add_clause(clause)
+    for clause in iter_clauses(clauses):
+        if var_offset:
+            clause = [lit + var_offset if lit > 0 else lit - var_offset for lit in clause]
+        solver.add_clause(clause + guard)
     
     solution_count = 0
+    num_positions = n * n
     
     print("Counting solutions...")
     
     # Incremental SAT solving loop
-    while True:
+    while max_solutions is None or solution_count < max_solutions:
         # Try to find a solution
-        if solver.solve():
-            # Get the model (satisfying assignment)
-            model = solver.get_model()
+        if solver.solve(assumptions=assumptions):
+            # Get the model (satisfying assignment) of this instance's variables
+            model = solver.get_model()[var_offset:]
             solution_count += 1
             
             if verbose:
@@ -159,33 +246,42 @@ def count_solutions(n, verbose=False):
                     print(f"Found {solution_count} solutions so far...")
             
             # Create blocking clause to exclude this solution
-            blocking_clause = []
-            for i in range(len(model)):
-                if model[i] > 0:
-                    blocking_clause.append(-(i + 1))
-                else:
-                    blocking_clause.append(i + 1)
+            # Every solution places exactly n queens, so forbidding this set of
+            # queen positions is enough; auxiliary variables are not blocked.
+            # The first n*n model literals are the position variables in order.
+            # Converting the slice to a NumPy array costs more than this
+            # comprehension at these sizes, so it stays plain Python
+            blocking_clause = [-lit for lit in model[:num_positions] if lit > 0]
             
             # Add the blocking clause to prevent finding the same solution again
-            solver.add_clause(blocking_clause)
+            solver.add_clause(blocking_clause + guard)
         else:
             # No more solutions
             break
     
-    # Clean up
-    solver.delete()
+    if own_solver:
+        # Clean up
+        solver.delete()
+    else:
+        # Disable this instance's clauses in the shared solver
+        solver.add_clause(guard)
     
     return solution_count
 
 def main():
     """Main function to handle command line arguments and execute the solution counting."""
-    if len(sys.argv) != 2:
-        print("Usage: python nqueens.py <N>")
+    args = sys.argv[1:]
+    use_jit = "--jit" in args
+    if use_jit:
+        args.remove("--jit")
+    
+    if len(args) != 1:
+        print("Usage: python nqueens.py <N> [--jit]")
         print("Example: python nqueens.py 8")
         sys.exit(1)
     
     try:
-        n = int(sys.argv[1])
+        n = int(args[0])
     except ValueError:
         print("Error: N must be an integer")
         sys.exit(1)
@@ -197,22 +293,27 @@ def main():
     print(f"Solving {n}-Queens problem...")
     print("=" * 40)
     
-    # Count solutions
-    solutions = count_solutions(n, verbose=(n <= 6))
+    verbose = n <= 6
+    
+    # Count solutions; when the result is only verified, enumeration can stop
+    # one past the known count, which is still enough to detect a mismatch
+    max_solutions = KNOWN_RESULTS[n] + 1 if n in KNOWN_RESULTS and not verbose else None
+    try:
+        solutions = count_solutions(n, verbose=verbose, max_solutions=max_solutions, use_jit=use_jit)
+    except ImportError:
+        print("Error: --jit needs numpy and numba (see requirements.txt)")
+        sys.exit(1)
     
     print("=" * 40)
     print(f"Number of solutions for {n}-Queens: {solutions}")
     
     # Verification against known results
-    known_results = {
-        4: 2, 5: 10, 6: 4, 7: 40, 8: 92, 9: 352, 10: 724,
-        11: 2680, 12: 14200, 13: 73712, 14: 365596
-    }
-    
-    if n in known_results:
-        expected = known_results[n]
+    if n in KNOWN_RESULTS:
+        expected = KNOWN_RESULTS[n]
         if solutions == expected:
             print(f"✓ Verification: Result matches OEIS A000170")
+        elif solutions == max_solutions:
+            print(f"✗ Verification: Expected {expected}, got more than {expected}")
         else:
             print(f"✗ Verification: Expected {expected}, got {solutions}")
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+JIT-compiled N-Queens SAT encoding
+
+Produces the same clauses as encode_nqueens in nqueens.py, but generates the
+at-most-one constraints with Numba into a preallocated int32 clause buffer,
+whose size is known in advance, instead of extending a flat array('i') from
+Python clause by clause. It is only used with "python nqueens.py <N> --jit".
+
+Run "python nqueens_numba.py [max_n]" to check that both encoders produce the
+same clauses for n = 1..max_n.
+
+Course: SAT Solving SS 2025
+"""
+
+import sys
+from array import array
+
+import numpy as np
+from numba import njit
+
+@njit(cache=True)
+def _at_most_one(variables, next_var_id, out, offset):
+    """
+    Write the at-most-one clauses for variables into out, starting at row offset.
+
+    Uses the same encoding as at_most_one in nqueens.py: pairwise for groups of
+    up to 5 variables, sequential counter (Sinz) for larger groups.
+
+    Returns:
+        tuple: (offset, next_var_id) after the written clauses and auxiliary variables
+    """
+    m = len(variables)
+
+    if m <= 5:
+        for v1_idx in range(m):
+            for v2_idx in range(v1_idx + 1, m):
+                out[offset, 0] = -variables[v1_idx]
+                out[offset, 1] = -variables[v2_idx]
+                offset += 1
+        return offset, next_var_id
+
+    # Counter variable for the prefix x_1..x_{i+1} is next_var_id + i
+    out[offset, 0] = -variables[0]
+    out[offset, 1] = next_var_id
+    offset += 1
+    for i in range(1, m - 1):
+        s_prev = next_var_id + i - 1
+        s_curr = next_var_id + i
+        out[offset, 0] = -variables[i]
+        out[offset, 1] = s_curr
+        out[offset + 1, 0] = -s_prev
+        out[offset + 1, 1] = s_curr
+        out[offset + 2, 0] = -variables[i]
+        out[offset + 2, 1] = -s_prev
+        offset += 3
+    out[offset, 0] = -variables[m - 1]
+    out[offset, 1] = -(next_var_id + m - 2)
+    offset += 1
+
+    return offset, next_var_id + m - 1
+
+@njit(cache=True)
+def _encode_all(n, out):
+    """
+    Write all at-most-one clauses of the N-Queens encoding into out.
+
+    Groups are processed in the same order as encode_nqueens: rows, columns,
+    diagonals and anti-diagonals.
+
+    Returns:
+        tuple: (num_clauses, num_vars) written to out and used in total
+    """
+    group = np.empty(n, dtype=np.int32)
+    offset = 0
+    next_var_id = n * n + 1
+
+    # Rows
+    for i in range(n):
+        for j in range(n):
+            group[j] = i * n + j + 1
+        offset, next_var_id = _at_most_one(group, next_var_id, out, offset)
+
+    # Columns
+    for j in range(n):
+        for i in range(n):
+            group[i] = i * n + j + 1
+        offset, next_var_id = _at_most_one(group, next_var_id, out, offset)
+
+    # Diagonals (top-left to bottom-right)
+    for d in range(-(n - 1), n):
+        size = 0
+        for i in range(n):
+            j = i + d
+            if 0 <= j < n:
+                group[size] = i * n + j + 1
+                size += 1
+        offset, next_var_id = _at_most_one(group[:size], next_var_id, out, offset)
+
+    # Anti-diagonals (top-right to bottom-left)
+    for d in range(2 * n - 1):
+        size = 0
+        for i in range(n):
+            j = d - i
+            if 0 <= j < n:
+                group[size] = i * n + j + 1
+                size += 1
+        offset, next_var_id = _at_most_one(group[:size], next_var_id, out, offset)
+
+    return offset, next_var_id - 1
+
+def _at_most_one_clause_count(m):
+    """Number of clauses _at_most_one emits for a group of m variables."""
+    if m <= 5:
+        return m * (m - 1) // 2
+    return 3 * m - 4
+
+def _num_binary_clauses(n):
+    """Closed-form number of at-most-one clauses in the N-Queens encoding."""
+    # n rows and n columns of length n; both diagonal directions have one
+    # diagonal of length n and two of every length 1..n-1
+    short_diagonals = sum(_at_most_one_clause_count(m) for m in range(1, n))
+    return 2 * n * _at_most_one_clause_count(n) + 2 * (_at_most_one_clause_count(n) + 2 * short_diagonals)
+
+def encode_nqueens(n):
+    """
+    Encode the N-Queens problem as SAT clauses using the JIT-compiled generator.
+
+    The clause set and variable numbering are the same as encode_nqueens in
+    nqueens.py; the at-least-one row clauses are listed first.
+
+    Args:
+        n (int): Board size (n x n)
+
+    Returns:
+        tuple: (clauses, num_vars) where clauses is a flat array('i') of
+               zero-terminated clauses and num_vars is total variables
+    """
+    # Third column stays 0 and terminates each binary clause
+    out = np.zeros((_num_binary_clauses(n), 3), dtype=np.intc)
+    num_clauses, num_vars = _encode_all(n, out)
+
+    # At least one queen per row, followed by its terminating 0
+    rows = np.zeros((n, n + 1), dtype=np.intc)
+    rows[:, :n] = np.arange(1, n * n + 1, dtype=np.intc).reshape(n, n)
+
+    clauses = array('i')
+    clauses.frombytes(rows.tobytes())
+    clauses.frombytes(out[:num_clauses].tobytes())
+
+    return clauses, num_vars
+
+def check_against_python(max_n):
+    """
+    Compare this encoder with encode_nqueens in nqueens.py for n = 1..max_n.
+    
+    Both must produce the same variable count and the same clauses, in any order.
+    
+    Returns:
+        list: Board sizes for which the clauses or variable counts differ
+    """
+    from nqueens import encode_nqueens as encode_nqueens_python, iter_clauses
+    
+    mismatches = []
+    for n in range(1, max_n + 1):
+        jit_clauses, jit_num_vars = encode_nqueens(n)
+        python_clauses, python_num_vars = encode_nqueens_python(n)
+        # The row clauses are placed differently, so clauses are compared as multisets
+        if (jit_num_vars != python_num_vars
+                or sorted(iter_clauses(jit_clauses)) != sorted(iter_clauses(python_clauses))):
+            mismatches.append(n)
+    return mismatches
+
+if __name__ == "__main__":
+    max_n = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    mismatches = check_against_python(max_n)
+    if mismatches:
+        print(f"✗ Encoders differ for n = {mismatches}")
+        sys.exit(1)
+    print(f"✓ JIT and Python encoders match for n = 1..{max_n}")
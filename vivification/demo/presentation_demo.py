@@ -1,7 +1,5 @@
 #!/usr/bin/env python3
 
-import sys
-sys.path.append('.')
 
 from src.vivification_solver import VivificationLSAT_Z3_Program
 from src.sat_problem_solver import LSAT_Z3_Program
@@ -4,6 +4,9 @@ import re
 
 TAB_STR = "    "
 CHOICE_INDEXES = ["(A)", "(B)", "(C)", "(D)", "(E)"]
+# compiled once at import; every constraint is searched with these repeatedly
+SCOPED_DISTINCT_REGEX = re.compile(r"Distinct\(\[[a-zA-Z0-9_]+:[a-zA-Z0-9_]")
+SCOPED_QUANTIFIER_REGEX = re.compile(r"(Exists|ForAll)\(\[([a-zA-Z0-9_]+):([a-zA-Z0-9_]+)")
 
 class CodeTranslator:
     class LineType(Enum):
@@ -118,8 +121,7 @@ class CodeTranslator:
 
     @staticmethod
     def handle_distinct_function(statement):
-        scoped_distinct_regex = r"Distinct\(\[[a-zA-Z0-9_]+:[a-zA-Z0-9_]"
-        match = re.search(scoped_distinct_regex, statement)
+        match = SCOPED_DISTINCT_REGEX.search(statement)
         index = match.start()
         content_start_index = index + len("Distinct")
         content_end_index = CodeTranslator.extract_paired_token_index(statement, content_start_index, "(", ")")
@@ -141,8 +143,7 @@ class CodeTranslator:
  
     @staticmethod
     def handle_quantifier_function(statement, scoped_list_to_type):
-        scoped_quantifier_regex = r"(Exists|ForAll)\(\[([a-zA-Z0-9_]+):([a-zA-Z0-9_]+)"
-        match = re.search(scoped_quantifier_regex, statement)
+        match = SCOPED_QUANTIFIER_REGEX.search(statement)
         quant_name = match.group(1)
 
         index = match.start()
@@ -190,14 +191,12 @@ class CodeTranslator:
         while "Count(" in constraint:
             constraint = CodeTranslator.handle_count_function(constraint)
 
-        scoped_distinct_regex = r"Distinct\(\[[a-zA-Z0-9_]+:[a-zA-Z0-9_]"
-        # check if we can find scoped_distinct_regex in constraint
-        while re.search(scoped_distinct_regex, constraint):
+        # check if we can find SCOPED_DISTINCT_REGEX in constraint
+        while SCOPED_DISTINCT_REGEX.search(constraint):
             constraint = CodeTranslator.handle_distinct_function(constraint)
 
-        scoped_quantifier_regex = r"(Exists|ForAll)\(\[([a-zA-Z0-9_]+):([a-zA-Z0-9_]+)"
         all_decl_lines = []
-        while re.search(scoped_quantifier_regex, constraint):
+        while SCOPED_QUANTIFIER_REGEX.search(constraint):
             decl_lines, constraint = CodeTranslator.handle_quantifier_function(constraint, scoped_list_to_type)
             all_decl_lines += decl_lines
 
@@ -235,24 +234,25 @@ class CodeTranslator:
                 lines += ["pre_conditions.append({})".format(line.line)]
         lines += [""]
 
+        # one solver holds the pre-conditions; each check guards its option with a
+        # fresh Boolean and decides it by solving under that single assumption
         function_lines = [
+            "_solver = Solver()",
+            "_solver.add(pre_conditions)",
+            "",
+            "def check_under_guard(constraint):",
+            TAB_STR + "guard = FreshBool()",
+            TAB_STR + "_solver.add(Implies(guard, constraint))",
+            TAB_STR + "return _solver.check(guard)",
+            "",
             "def is_valid(option_constraints):",
-            TAB_STR + "solver = Solver()",
-            TAB_STR + "solver.add(pre_conditions)",
-            TAB_STR + "solver.add(Not(option_constraints))",
-            TAB_STR + "return solver.check() == unsat",
+            TAB_STR + "return check_under_guard(Not(option_constraints)) == unsat",
             "",
             "def is_unsat(option_constraints):",
-            TAB_STR + "solver = Solver()",
-            TAB_STR + "solver.add(pre_conditions)",
-            TAB_STR + "solver.add(option_constraints)",
-            TAB_STR + "return solver.check() == unsat",
+            TAB_STR + "return check_under_guard(option_constraints) == unsat",
             "",
             "def is_sat(option_constraints):",
-            TAB_STR + "solver = Solver()",
-            TAB_STR + "solver.add(pre_conditions)",
-            TAB_STR + "solver.add(option_constraints)",
-            TAB_STR + "return solver.check() == sat",
+            TAB_STR + "return check_under_guard(option_constraints) == sat",
             "",
             "def is_accurate_list(option_constraints):",
             TAB_STR + "return is_valid(Or(option_constraints)) and all([is_sat(c) for c in option_constraints])",
@@ -1,13 +1,23 @@
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 from .code_translator import *
 import subprocess
 from subprocess import check_output
-from os.path import join
 import os
+import hashlib
+import tempfile
+
+ParsedLogicProgram = namedtuple(
+    "ParsedLogicProgram",
+    "enum_sorts int_sorts lists functions variable_constraints constraints options"
+)
 
 class LSAT_Z3_Program:
-    def __init__(self, logic_program:str, dataset_name:str) -> None:
+    # sha256 of the generated code -> (result, error) of executing it
+    _result_cache = {}
+
+    def __init__(self, logic_program:str, dataset_name:str, parsed:ParsedLogicProgram=None) -> None:
         self.logic_program = logic_program
+        self.parsed = parsed
         try:
             self.parse_logic_program()
             self.standard_code = self.to_standard_code()
@@ -25,9 +35,31 @@ class LSAT_Z3_Program:
             os.makedirs(cache_dir)
         self.cache_dir = cache_dir
 
+    @classmethod
+    def from_parsed(cls, parsed, dataset_name, **kwargs):
+        """Create a program from the result of _parse without parsing the DSL text again"""
+        return cls(None, dataset_name, parsed=parsed, **kwargs)
+
     def parse_logic_program(self):
+        try:
+            parsed = self.parsed if self.parsed is not None else self._parse(self.logic_program)
+        except Exception as e:
+            return False
+
+        (self.declared_enum_sorts, self.declared_int_sorts, self.declared_lists, self.declared_functions, self.variable_constrants) = parsed[:5]
+        self.declared_int_lists = OrderedDict(self.declared_int_sorts)
+
+        # copies, since subclasses may rewrite the constraints of a shared parse
+        self.constraints = list(parsed.constraints)
+        self.options = list(parsed.options)
+        
+        return True
+
+    @staticmethod
+    def _parse(logic_program):
+        """Parse the DSL text into a ParsedLogicProgram that can be shared between programs"""
         # split the logic program into different parts
-        lines = [x for x in self.logic_program.splitlines() if not x.strip() == ""]
+        lines = [x for x in logic_program.splitlines() if not x.strip() == ""]
 
         decleration_start_index = lines.index("# Declarations")
         constraint_start_index = lines.index("# Constraints")
@@ -37,20 +69,18 @@ class LSAT_Z3_Program:
         constraint_statements = lines[constraint_start_index + 1:option_start_index]
         option_statements = lines[option_start_index + 1:]
 
-        try:
-            (self.declared_enum_sorts, self.declared_int_sorts, self.declared_lists, self.declared_functions, self.variable_constrants) = self.parse_declaration_statements(declaration_statements)
+        declarations = LSAT_Z3_Program.parse_declaration_statements(declaration_statements)
 
-            self.constraints = [x.split(':::')[0].strip() for x in constraint_statements]
-            self.options = [x.split(':::')[0].strip() for x in option_statements if not x.startswith("Question :::")]
-        except Exception as e:
-            return False
-        
-        return True
+        constraints = tuple(x.split(':::')[0].strip() for x in constraint_statements)
+        options = tuple(x.split(':::')[0].strip() for x in option_statements if not x.startswith("Question :::"))
+
+        return ParsedLogicProgram(*declarations, constraints, options)
 
     def __repr__(self):
         return f"LSATSatProblem:\n\tDeclared Enum Sorts: {self.declared_enum_sorts}\n\tDeclared Lists: {self.declared_lists}\n\tDeclared Functions: {self.declared_functions}\n\tConstraints: {self.constraints}\n\tOptions: {self.options}"
 
-    def parse_declaration_statements(self, declaration_statements):
+    @staticmethod
+    def parse_declaration_statements(declaration_statements):
         enum_sort_declarations = OrderedDict()
         int_sort_declarations = OrderedDict()
         function_declarations = OrderedDict()
@@ -89,7 +119,6 @@ class LSAT_Z3_Program:
 
         declared_enum_sorts = OrderedDict()
         declared_lists = OrderedDict()
-        self.declared_int_lists = OrderedDict()
 
         declared_functions = function_declarations
         already_declared = set()
@@ -100,10 +129,6 @@ class LSAT_Z3_Program:
                 already_declared.update(members)
             declared_lists[name] = members
 
-        for name, members in int_sort_declarations.items():
-            self.declared_int_lists[name] = members
-            # declared_lists[name] = members
-
         return declared_enum_sorts, int_sort_declarations, declared_lists, declared_functions, variable_constrant_statements
     
     def to_standard_code(self):
@@ -166,9 +191,30 @@ class LSAT_Z3_Program:
 
         return CodeTranslator.assemble_standard_code(declaration_lines, pre_condidtion_lines, option_blocks)
     
-    def execute_program(self):
-        filename = join(self.cache_dir, f'tmp.py')
-        with open(filename, "w") as f:
+    def execute_program(self, use_cache=False):
+        # identical programs give identical answers, so with use_cache results
+        # are shared between all instances, keyed by the hash of the generated
+        # code; off by default, since a cache hit skips the solve being timed
+        if not use_cache:
+            return self._run_program()
+
+        key = hashlib.sha256(self.standard_code.encode("utf-8")).hexdigest()
+        if key in LSAT_Z3_Program._result_cache:
+            result, error = LSAT_Z3_Program._result_cache[key]
+            # callers get their own copy of the answer list
+            return (list(result) if result is not None else None), error
+
+        result, error = self._run_program()
+        # a timeout may not repeat on the next run, so it is not cached
+        if error != 'TimeoutError':
+            # the cache keeps its own copy, so the caller may change result
+            LSAT_Z3_Program._result_cache[key] = ((list(result) if result is not None else None), error)
+        return result, error
+
+    def _run_program(self):
+        # unique file per run, so programs can be executed concurrently
+        fd, filename = tempfile.mkstemp(suffix='.py', prefix='tmp_', dir=self.cache_dir)
+        with os.fdopen(fd, "w") as f:
             f.write(self.standard_code)
         try:
             venv_python = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "venv", "bin", "python")
@@ -181,6 +227,8 @@ class LSAT_Z3_Program:
             return None, outputs
         except subprocess.TimeoutExpired:
             return None, 'TimeoutError'
+        finally:
+            os.remove(filename)
         output = output.decode("utf-8").strip()
         result = output.splitlines()
         if len(result) == 0:
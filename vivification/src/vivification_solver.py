@@ -4,10 +4,18 @@ Vivification implementation with conservative redundancy detection
 """
 
 from .sat_problem_solver import LSAT_Z3_Program
+import re
 import time
 
+_SPACE_AROUND_PUNCTUATION = re.compile(r"\s*([()\[\],])\s*")
+_SPACE_AROUND_COMPARISON = re.compile(r"\s*(==|!=)\s*")
+
+def _is_balanced(expression):
+    """Whether every bracket opened in expression is also closed in it"""
+    return expression.count("(") == expression.count(")") and expression.count("[") == expression.count("]")
+
 class VivificationLSAT_Z3_Program(LSAT_Z3_Program):
-    def __init__(self, logic_program: str, dataset_name: str, use_vivification=True):
+    def __init__(self, logic_program: str, dataset_name: str, use_vivification=True, parsed=None):
         self.use_vivification = use_vivification
         self.vivification_stats = {
             'original_constraints': 0,
@@ -16,15 +24,28 @@ class VivificationLSAT_Z3_Program(LSAT_Z3_Program):
             'vivification_time': 0.0
         }
         
-        # Initialize parent class
-        super().__init__(logic_program, dataset_name)
+        # Initialize parent class; vivification runs from parse_logic_program
+        super().__init__(logic_program, dataset_name, parsed=parsed)
+    
+    def parse_logic_program(self):
+        """Parse the program and apply vivification before the Z3 code is generated"""
+        parsed = super().parse_logic_program()
         
-        # Apply conservative vivification
-        if self.use_vivification and self.flag:
+        # Vivifying here means the standard code is generated only once,
+        # from the vivified constraints
+        if parsed and self.use_vivification:
             self._apply_conservative_vivification()
+        
+        return parsed
     
     def _apply_conservative_vivification(self):
         """Apply conservative vivification focusing on obvious redundancies"""
+        # With fewer than two constraints nothing can be redundant
+        if len(self.constraints) < 2:
+            self.vivification_stats['original_constraints'] = len(self.constraints)
+            self.vivification_stats['final_constraints'] = len(self.constraints)
+            return
+        
         print("=== Applying Conservative Vivification ===")
         
         start_time = time.time()
@@ -42,8 +63,6 @@ class VivificationLSAT_Z3_Program(LSAT_Z3_Program):
         # Only update if we actually found redundancies
         if len(vivified_constraints) < len(self.constraints):
             self.constraints = vivified_constraints
-            # Regenerate Z3 code with vivified constraints
-            self.standard_code = self.to_standard_code()
         
         self.vivification_stats['final_constraints'] = len(self.constraints)
         self.vivification_stats['removed_constraints'] = original_constraint_count - len(self.constraints)
@@ -62,16 +81,16 @@ class VivificationLSAT_Z3_Program(LSAT_Z3_Program):
         """
         vivified_constraints = []
         
+        # Redundancy is decided syntactically, before any Z3 code is generated
+        redundant = self._syntactic_simplify(constraints)
+        
         print("\nApplying conservative vivification...")
         
         for constraint_idx, target_constraint in enumerate(constraints):
             print(f"\nChecking constraint {constraint_idx + 1}/{len(constraints)}")
             print(f"  Target: {target_constraint}")
             
-            # Check for obvious patterns of redundancy
-            is_redundant = self._is_obviously_redundant(target_constraint, constraints, constraint_idx)
-            
-            if is_redundant:
+            if redundant[constraint_idx]:
                 print(f"  → REMOVED (obviously redundant)")
             else:
                 print(f"  → KEPT")
@@ -79,37 +98,97 @@ class VivificationLSAT_Z3_Program(LSAT_Z3_Program):
         
         return vivified_constraints
     
-    def _is_obviously_redundant(self, target_constraint, all_constraints, target_idx):
+    def _syntactic_simplify(self, constraints):
         """
-        Conservative check for obvious redundancy patterns
+        Mark constraints that are redundant by their canonical form alone
+        
+        Two patterns are detected:
+        1. Duplicates of an earlier constraint, up to whitespace and operand order
+        2. Comparisons of a term with enum members that the other comparisons
+           of the same term already imply (see _domain_mask)
+        
+        Returns a list with True for every constraint that can be dropped
         """
-        # Pattern 1: If we have "x == a" and "x != b" where a != b, then "x != b" is redundant
-        other_constraints = [c for i, c in enumerate(all_constraints) if i != target_idx]
+        keys = [self._canonical_key(c) for c in constraints]
+        
+        # Enum member -> (sort name, bit index of the member within its sort)
+        member_bits = {}
+        for sort_name, members in self.declared_enum_sorts.items():
+            for bit, member in enumerate(members):
+                member_bits[member] = (sort_name, bit)
+        
+        # Constraints already seen, so only later copies count as duplicates
+        seen = set()
+        redundant = []
+        # (term, sort name) -> [(constraint index, mask of allowed values)]
+        domains = {}
+        for idx, key in enumerate(keys):
+            redundant.append(key in seen)
+            seen.add(key)
+            domain = None if redundant[idx] else self._domain_mask(key, member_bits)
+            if domain is not None:
+                term_sort, mask = domain
+                domains.setdefault(term_sort, []).append((idx, mask))
+        
+        for (term, sort_name), masks in domains.items():
+            full = (1 << len(self.declared_enum_sorts[sort_name])) - 1
+            # Disequalities are tried first, so the equality they follow from is kept
+            for idx, mask in sorted(masks, key=lambda x: keys[x[0]][0] == "=="):
+                # Values allowed by the other constraints on this term that are kept
+                others = full
+                for other_idx, other_mask in masks:
+                    if other_idx != idx and not redundant[other_idx]:
+                        others &= other_mask
+                if others & ~mask == 0:
+                    redundant[idx] = True
+        
+        return redundant
+    
+    @staticmethod
+    def _domain_mask(key, member_bits):
+        """
+        Bitmask of the values a canonical comparison allows for its term
         
-        # Look for negation redundancy
-        if " != " in target_constraint:
-            var_part = target_constraint.split(" != ")[0].strip()
-            neg_value = target_constraint.split(" != ")[1].strip()
-            
-            # Check if there's a positive constraint that makes this negative one redundant
-            for other_constraint in other_constraints:
-                if " == " in other_constraint:
-                    other_var = other_constraint.split(" == ")[0].strip()
-                    pos_value = other_constraint.split(" == ")[1].strip()
-                    
-                    # If same variable is assigned to a different value, the != is redundant
-                    if var_part == other_var and pos_value != neg_value:
-                        return True
-        
-        # Pattern 2: Exact duplicates
-        for other_constraint in other_constraints:
-            if target_constraint == other_constraint:
-                return True
-        
-        # Pattern 3: Simple logical implications we can detect with string matching
-        # This is conservative - only catches obvious cases
-        
-        return False  # Default: keep the constraint
+        Bit i stands for the i-th member of an enum sort. "term == v" allows
+        only the bit of v and "term != v" every other bit, so a set of such
+        constraints allows the AND of their masks.
+        
+        Returns ((term, sort name), mask), or None if key does not compare a
+        term with an enum member
+        """
+        op, lhs, rhs = key
+        if op is None or (lhs in member_bits) == (rhs in member_bits):
+            return None
+        term, value = (rhs, lhs) if lhs in member_bits else (lhs, rhs)
+        sort_name, bit = member_bits[value]
+        mask = 1 << bit
+        return (term, sort_name), (mask if op == "==" else ~mask)
+    
+    @classmethod
+    def _canonical_key(cls, constraint):
+        """
+        Canonical, hashable form of a constraint: whitespace is normalized and
+        the operands of "==" and "!=" are sorted
+        """
+        normalized = _SPACE_AROUND_PUNCTUATION.sub(r"\1", constraint.strip())
+        normalized = _SPACE_AROUND_COMPARISON.sub(r" \1 ", " ".join(normalized.split()))
+        op, lhs, rhs = cls._parse_constraint(normalized)
+        if op is None:
+            return None, normalized, None
+        return (op,) + tuple(sorted((lhs, rhs)))
+    
+    @staticmethod
+    def _parse_constraint(constraint):
+        """
+        Split a top-level "==" or "!=" comparison into (op, lhs, rhs),
+        or return (None, constraint, None) for anything else
+        """
+        for op in ("==", "!="):
+            lhs, sep, rhs = constraint.partition(f" {op} ")
+            # An operator nested inside a call leaves unbalanced brackets on both sides
+            if sep and _is_balanced(lhs) and _is_balanced(rhs):
+                return op, lhs.strip(), rhs.strip()
+        return None, constraint, None
     
     def _print_vivification_stats(self):
         """Print vivification statistics"""
@@ -124,9 +203,9 @@ class VivificationLSAT_Z3_Program(LSAT_Z3_Program):
             reduction_percent = (stats['removed_constraints'] / stats['original_constraints']) * 100
             print(f"Constraint reduction: {reduction_percent:.1f}%")
     
-    def execute_program(self):
+    def execute_program(self, use_cache=False):
         """Execute the vivified program"""
-        result, error = super().execute_program()
+        result, error = super().execute_program(use_cache=use_cache)
         
         if self.use_vivification:
             print("\n=== Conservative Vivification Applied ===")
@@ -3,14 +3,30 @@
 Comprehensive test suite for vivification 
 """
 
-import sys
-sys.path.append('.')
 
 from src.vivification_solver import VivificationLSAT_Z3_Program
 from src.sat_problem_solver import LSAT_Z3_Program
-from educational_examples import get_all_examples
+from tests.educational_examples import get_all_examples
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+import io
+import os
 import time
 
+def solve_example(program_class, logic_program, kwargs):
+    """Build and execute one program, returning its result, timing and captured output"""
+    log = io.StringIO()
+    with redirect_stdout(log):
+        start_time = time.time()
+        program = program_class(logic_program, 'TEST', **kwargs)
+        if not program.flag:
+            return None, log.getvalue()
+        result, _ = program.execute_program()
+        elapsed = time.time() - start_time
+    
+    stats = getattr(program, 'vivification_stats', None)
+    return (result, elapsed, len(program.constraints), stats), log.getvalue()
+
 def run_comprehensive_tests():
     """Run all vivification tests"""
     print("="*60)
@@ -20,29 +36,35 @@ def run_comprehensive_tests():
     examples = get_all_examples()
     results = []
     
+    # Standard and vivification solving of every example are independent,
+    # so all of them run in parallel worker processes
+    jobs = []
     for example_name, logic_program in examples:
+        jobs.append((LSAT_Z3_Program, logic_program, {}))
+        jobs.append((VivificationLSAT_Z3_Program, logic_program, {'use_vivification': True}))
+    
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        outcomes = list(executor.map(solve_example, *zip(*jobs)))
+    
+    for idx, (example_name, logic_program) in enumerate(examples):
+        (standard_outcome, standard_log), (vivification_outcome, vivification_log) = outcomes[2 * idx:2 * idx + 2]
+        
         print(f"\n{'='*20} {example_name} {'='*20}")
         
         # Test standard solving
         print("\n--- Standard Solving ---")
-        start_time = time.time()
-        standard_program = LSAT_Z3_Program(logic_program, 'TEST')
-        if standard_program.flag:
-            standard_result, _ = standard_program.execute_program()
-            standard_time = time.time() - start_time
-            standard_constraints = len(standard_program.constraints)
+        print(standard_log, end="")
+        if standard_outcome:
+            standard_result, standard_time, standard_constraints, _ = standard_outcome
         else:
             print("❌ Standard program failed")
             continue
         
         # Test vivification solving
         print("\n--- Vivification Solving ---")
-        start_time = time.time()
-        vivification_program = VivificationLSAT_Z3_Program(logic_program, 'TEST', use_vivification=True)
-        if vivification_program.flag:
-            vivification_result, _ = vivification_program.execute_program()
-            vivification_time = time.time() - start_time
-            vivification_stats = vivification_program.vivification_stats
+        print(vivification_log, end="")
+        if vivification_outcome:
+            vivification_result, vivification_time, _, vivification_stats = vivification_outcome
         else:
             print("❌ Vivification program failed")
             continue
@@ -53,9 +53,28 @@ rel(a) != rel(c) ::: a and c map to different values
 Question ::: Are all mappings different?
 is_valid(rel(a) != rel(b)) ::: (A)'''
 
+def example_4_domain_reasoning():
+    """Disequalities that together leave one value, next to a term comparison that must stay"""
+    return '''# Declarations
+people = EnumSort([Alice, Bob])
+colors = EnumSort([red, blue, green])
+likes = Function([people] -> [colors])
+
+# Constraints
+likes(Alice) != red ::: Alice doesn't like red (REDUNDANT)
+likes(Alice) != green ::: Alice doesn't like green (REDUNDANT)
+likes(Alice) == blue ::: Alice likes blue, the only color the two above leave
+likes(Alice) != likes(Bob) ::: Alice and Bob like different colors (NOT redundant: likes(Bob) is not a color constant)
+
+# Options
+Question ::: Which must be true?
+is_valid(likes(Bob) != blue) ::: (A)
+is_valid(likes(Bob) == red) ::: (B)'''
+
 def get_all_examples():
     return [
         ("Basic Redundancy", example_1_basic_redundancy()),
         ("Complex Redundancy", example_2_complex_redundancy()),
-        ("No Redundancy", example_3_no_redundancy())
+        ("No Redundancy", example_3_no_redundancy()),
+        ("Domain Reasoning", example_4_domain_reasoning())
     ]